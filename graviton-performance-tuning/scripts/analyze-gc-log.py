@@ -0,0 +1,768 @@
+#!/usr/bin/env python3
+"""
+AWS Graviton Performance Tuning - JVM GC/Safepoint Log Analyzer
+Streams unified JVM logs (-Xlog:gc*,safepoint) and reports pause percentiles,
+allocation/promotion rates, stop-the-world GC CPU and time-to-safepoint.
+Optionally compares two logs (e.g. before/after tuning, or x86 vs Graviton).
+
+Logs are processed line by line; percentiles come from a fixed-precision
+log-bucketed histogram, so memory use stays bounded for multi-GB logs.
+"""
+
+import argparse
+import gzip
+import json
+import math
+import re
+import sys
+from datetime import datetime
+from pathlib import Path
+
+
+# Recommended logging flags (JDK 11+)
+XLOG_FLAGS = "-Xlog:gc*,safepoint:file=gc.log:time,uptime,level,tags:filecount=10,filesize=100m"
+
+# Leading decorators, e.g. "[2024-01-01T00:00:00.000+0000][0.123s][info][gc,heap ]"
+DECORATORS_RE = re.compile(r"^((?:\[[^\]]*\])+)\s?(.*)$")
+
+# "GC(12) Pause Young (Normal) (G1 Evacuation Pause) 24M->4M(256M) 5.123ms"
+# "GC(3) Pause Mark Start 0.012ms"  (ZGC, optional "y: "/"O: " generation prefix)
+PAUSE_RE = re.compile(
+    r"GC\((\d+)\)\s+(?:[yYoO]:\s+)?(Pause .*?)\s*"
+    r"(?:(\d+(?:\.\d+)?)([BKMGT])->(\d+(?:\.\d+)?)([BKMGT])\((\d+(?:\.\d+)?)([BKMGT])\)\s+)?"
+    r"(\d+(?:\.\d+)?)ms$"
+)
+
+# "GC(7) Concurrent Mark Cycle 12.345ms", "GC(0) Concurrent Mark 1.234ms"
+# Shenandoah: "GC(2) Concurrent cleanup 52M->50M(256M) 0.012ms"
+CONCURRENT_RE = re.compile(
+    r"GC\((\d+)\)\s+(?:[yYoO]:\s+)?(Concurrent .*?)\s*"
+    r"(?:(\d+(?:\.\d+)?)([BKMGT])->(\d+(?:\.\d+)?)([BKMGT])\(\d+(?:\.\d+)?[BKMGT]\)\s+)?"
+    r"(\d+(?:\.\d+)?)ms$"
+)
+
+# Heap transition on ZGC cycle summaries: "Garbage Collection (Warmup) 10M(1%)->8M(1%)"
+ZGC_CYCLE_RE = re.compile(
+    r"GC\((\d+)\)\s+(?:Garbage|Major|Minor) Collection \([^)]*\)\s+"
+    r"(\d+(?:\.\d+)?)([BKMGT])\(\d+%\)->(\d+(?:\.\d+)?)([BKMGT])\(\d+%\)"
+)
+
+# Old generation occupancy: G1 "Old regions: 10->12", Parallel/Serial/CMS
+# "ParOldGen: 0K->8K(175104K)" (JDK 11) or "ParOldGen: 0K(173568K)->8K(173568K)" (JDK 17+)
+G1_OLD_RE = re.compile(r"GC\((\d+)\)\s+Old regions:\s+(\d+)->(\d+)")
+OLD_GEN_RE = re.compile(
+    r"GC\((\d+)\)\s+(?:ParOldGen|PSOldGen|Tenured|CMS):\s+"
+    r"(\d+(?:\.\d+)?)([BKMGT])(?:\(\d+(?:\.\d+)?[BKMGT]\))?->"
+    r"(\d+(?:\.\d+)?)([BKMGT])(?:\(\d+(?:\.\d+)?[BKMGT]\))?"
+)
+REGION_SIZE_RE = re.compile(r"Heap [Rr]egion [Ss]ize:\s+(\d+)([BKMGT])")
+CPUS_RE = re.compile(r"CPUs:\s+(\d+) total,\s+(\d+) available")
+
+# "GC(0) User=0.01s Sys=0.00s Real=0.01s"
+GC_CPU_RE = re.compile(r"User=(\d+(?:\.\d+)?)s\s+Sys=(\d+(?:\.\d+)?)s\s+Real=(\d+(?:\.\d+)?)s")
+
+# JDK 13+: 'Safepoint "G1CollectForAllocation", Time since last: 1 ns, Reaching safepoint: 2 ns, ... Total: 3 ns'
+SAFEPOINT_RE = re.compile(r'Safepoint "([^"]+)".*?Reaching safepoint: (\d+) ns.*?Total: (\d+) ns')
+# JDK 11: "Total time for which application threads were stopped: 0.0001 seconds, Stopping threads took: 0.00001 seconds"
+SAFEPOINT_LEGACY_RE = re.compile(
+    r"Total time for which application threads were stopped: (\d+(?:\.\d+)?) seconds, "
+    r"Stopping threads took: (\d+(?:\.\d+)?) seconds"
+)
+
+UNIT_TO_MB = {"B": 1.0 / (1024 * 1024), "K": 1.0 / 1024, "M": 1.0, "G": 1024.0, "T": 1024.0 * 1024}
+PERCENTILES = (50, 90, 99, 99.9)
+
+# Bounds on per-GC bookkeeping so interleaved/partial logs cannot grow memory
+MAX_PENDING_GCS = 64
+MAX_CAUSES = 256
+
+
+def to_mb(value, unit):
+    """Convert a JVM size (value + K/M/G suffix) to MB"""
+    return float(value) * UNIT_TO_MB[unit]
+
+
+class LogHistogram:
+    """Log-bucketed histogram with bounded relative error (HdrHistogram-style)"""
+
+    def __init__(self, precision=0.01, floor=1e-6):
+        self.floor = floor
+        self.log_base = math.log1p(precision)
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def record(self, value):
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        index = int(math.log(max(value, self.floor) / self.floor) / self.log_base)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def percentile(self, pct):
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(self.count * pct / 100.0))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                # Geometric midpoint of the bucket, clamped to observed range
+                value = self.floor * math.exp((index + 0.5) * self.log_base)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def summary(self):
+        result = {
+            "count": self.count or None,
+            "total": round(self.total, 3) if self.count else None,
+            "mean": round(self.total / self.count, 3) if self.count else None,
+            "max": round(self.max, 3) if self.max is not None else None,
+        }
+        for pct in PERCENTILES:
+            value = self.percentile(pct)
+            result[f"p{pct:g}"] = round(value, 3) if value is not None else None
+        return result
+
+
+class GCLogAnalyzer:
+    """Streaming analyzer for unified JVM GC and safepoint logs"""
+
+    def __init__(self, cpus=None):
+        self.cpus = cpus
+        self.lines = 0
+        self.elapsed_s = 0.0
+        self.last_ts = None
+
+        self.pauses = LogHistogram()
+        self.pause_causes = {}
+        self.concurrent_ms = 0.0
+        self.concurrent_phases = 0
+
+        self.allocated_mb = 0.0
+        self.promoted_mb = 0.0
+        self.young_allocated_mb = 0.0
+        self.old_gen_seen = False
+        self.last_heap_after = None
+        self.peak_heap_mb = None
+        self.region_size_mb = None
+        self.pending_old = {}
+
+        self.gc_user_s = 0.0
+        self.gc_sys_s = 0.0
+        self.gc_real_s = 0.0
+        self.gc_cpu_seen = False
+
+        self.ttsp = LogHistogram()
+        self.safepoints = LogHistogram()
+        self.safepoint_ops = {}
+
+    # ---- Parsing ----
+
+    def parse_timestamp(self, decorators):
+        """Return seconds from an uptime decorator, falling back to wall-clock time"""
+        wall_clock = None
+        for deco in decorators:
+            deco = deco.strip()
+            try:
+                if deco.endswith("ns"):
+                    return int(deco[:-2]) / 1e9
+                if deco.endswith("ms"):
+                    return int(deco[:-2]) / 1e3
+                if deco.endswith("s"):
+                    return float(deco[:-1])
+            except ValueError:
+                pass
+            if wall_clock is None and "T" in deco and "-" in deco:
+                wall_clock = deco
+        if wall_clock is not None:
+            try:
+                return datetime.strptime(wall_clock, "%Y-%m-%dT%H:%M:%S.%f%z").timestamp()
+            except ValueError:
+                pass
+        return None
+
+    def feed(self, line):
+        """Consume one log line"""
+        self.lines += 1
+        match = DECORATORS_RE.match(line.rstrip("\r\n"))
+        if not match:
+            return
+        decorators = match.group(1)[1:-1].split("][")
+        message = match.group(2)
+        tags = decorators[-1].strip()
+
+        ts = self.parse_timestamp(decorators)
+        if ts is not None:
+            # Sum monotonic segments only: rotated or concatenated logs from
+            # several JVM runs restart uptime, which must not count as negative time
+            if self.last_ts is not None and ts >= self.last_ts:
+                self.elapsed_s += ts - self.last_ts
+            self.last_ts = ts
+
+        if tags.startswith("safepoint"):
+            self._feed_safepoint(message)
+        elif tags.startswith("gc"):
+            self._feed_gc(tags, message)
+
+    def _feed_safepoint(self, message):
+        match = SAFEPOINT_RE.search(message)
+        if match:
+            op, reaching_ns, total_ns = match.group(1), int(match.group(2)), int(match.group(3))
+            self._record_safepoint(op, reaching_ns / 1e6, total_ns / 1e6)
+            return
+        match = SAFEPOINT_LEGACY_RE.search(message)
+        if match:
+            self._record_safepoint(None, float(match.group(2)) * 1e3, float(match.group(1)) * 1e3)
+
+    def _record_safepoint(self, op, ttsp_ms, total_ms):
+        self.ttsp.record(ttsp_ms)
+        self.safepoints.record(total_ms)
+        if op is not None and (op in self.safepoint_ops or len(self.safepoint_ops) < MAX_CAUSES):
+            stats = self.safepoint_ops.setdefault(op, {"count": 0, "total_ms": 0.0, "max_ttsp_ms": 0.0})
+            stats["count"] += 1
+            stats["total_ms"] += total_ms
+            stats["max_ttsp_ms"] = max(stats["max_ttsp_ms"], ttsp_ms)
+
+    def _feed_gc(self, tags, message):
+        if tags == "gc":
+            match = PAUSE_RE.search(message)
+            if match:
+                self._record_pause(match)
+                return
+            match = CONCURRENT_RE.search(message)
+            if match:
+                self._record_concurrent(match)
+                return
+            match = ZGC_CYCLE_RE.search(message)
+            if match:
+                self._record_heap(to_mb(match.group(2), match.group(3)), to_mb(match.group(4), match.group(5)))
+            return
+
+        if tags == "gc,phases":
+            # ZGC reports its pauses and concurrent phases under gc,phases
+            match = PAUSE_RE.search(message)
+            if match:
+                self._record_pause(match)
+                return
+            match = CONCURRENT_RE.search(message)
+            if match:
+                self._record_concurrent(match)
+            return
+
+        if tags == "gc,cpu":
+            match = GC_CPU_RE.search(message)
+            if match:
+                self.gc_user_s += float(match.group(1))
+                self.gc_sys_s += float(match.group(2))
+                self.gc_real_s += float(match.group(3))
+                self.gc_cpu_seen = True
+            return
+
+        if tags == "gc,heap":
+            match = G1_OLD_RE.search(message)
+            if match and self.region_size_mb:
+                before = int(match.group(2)) * self.region_size_mb
+                after = int(match.group(3)) * self.region_size_mb
+                self._remember_old(match.group(1), before, after)
+                return
+            match = OLD_GEN_RE.search(message)
+            if match:
+                before = to_mb(match.group(2), match.group(3))
+                after = to_mb(match.group(4), match.group(5))
+                self._remember_old(match.group(1), before, after)
+                return
+
+        if self.region_size_mb is None:
+            match = REGION_SIZE_RE.search(message)
+            if match:
+                self.region_size_mb = to_mb(match.group(1), match.group(2))
+                return
+        if self.cpus is None:
+            match = CPUS_RE.search(message)
+            if match:
+                self.cpus = int(match.group(2))
+
+    def _remember_old(self, gc_id, before, after):
+        self.old_gen_seen = True
+        if len(self.pending_old) >= MAX_PENDING_GCS:
+            self.pending_old.pop(next(iter(self.pending_old)))
+        self.pending_old[gc_id] = (before, after)
+
+    def _record_pause(self, match):
+        gc_id, name, duration = match.group(1), match.group(2).strip(), float(match.group(9))
+        self.pauses.record(duration)
+
+        if name in self.pause_causes or len(self.pause_causes) < MAX_CAUSES:
+            stats = self.pause_causes.setdefault(name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            stats["count"] += 1
+            stats["total_ms"] += duration
+            stats["max_ms"] = max(stats["max_ms"], duration)
+
+        allocated = 0.0
+        if match.group(3):
+            allocated = self._record_heap(to_mb(match.group(3), match.group(4)), to_mb(match.group(5), match.group(6)))
+
+        old = self.pending_old.pop(gc_id, None)
+        if old and "Young" in name and "Mixed" not in name:
+            # Promotion = old-gen growth across a young-only collection; mixed
+            # pauses also evacuate old regions, which would mask promotion
+            self.promoted_mb += max(0.0, old[1] - old[0])
+            self.young_allocated_mb += allocated
+
+    def _record_concurrent(self, match):
+        self.concurrent_phases += 1
+        self.concurrent_ms += float(match.group(7))
+        if match.group(3):
+            before = to_mb(match.group(3), match.group(4))
+            after = to_mb(match.group(5), match.group(6))
+            self._record_heap(before, after, concurrent=True)
+
+    def _record_heap(self, before, after, concurrent=False):
+        """Account heap growth as allocation and return the amount added"""
+        # Allocation = heap growth between the end of one GC and the start of the next
+        allocated = max(0.0, before - self.last_heap_after) if self.last_heap_after is not None else 0.0
+        if concurrent:
+            # The application keeps allocating while a concurrent phase runs
+            allocated += max(0.0, after - before)
+        self.allocated_mb += allocated
+        self.last_heap_after = after
+        peak = max(before, after)
+        self.peak_heap_mb = peak if self.peak_heap_mb is None else max(self.peak_heap_mb, peak)
+        return allocated
+
+    # ---- Results ----
+
+    def results(self):
+        """Summarize the log; metrics without source lines in the log are None"""
+        elapsed = self.elapsed_s
+        # gc,cpu is only logged for stop-the-world pauses, not concurrent GC work
+        stw_gc_cpu_s = (self.gc_user_s + self.gc_sys_s) if self.gc_cpu_seen else None
+        allocated_mb = self.allocated_mb if self.last_heap_after is not None else None
+        promoted_mb = self.promoted_mb if self.old_gen_seen else None
+
+        def rounded(value):
+            return round(value, 3) if value is not None else None
+
+        def per_second(value):
+            return round(value / elapsed, 3) if value is not None and elapsed > 0 else None
+
+        def percent(value, denominator):
+            return round(value / denominator * 100, 3) if value is not None and denominator else None
+
+        def per_elapsed(count):
+            return round(count / elapsed, 3) if count and elapsed > 0 else None
+
+        return {
+            "lines": self.lines,
+            "elapsed_s": round(elapsed, 3),
+            "pauses_ms": self.pauses.summary(),
+            "pause_causes": {
+                name: {k: round(v, 3) for k, v in stats.items()}
+                for name, stats in sorted(self.pause_causes.items(), key=lambda item: -item[1]["total_ms"])
+            },
+            "concurrent": {"phases": self.concurrent_phases, "total_ms": round(self.concurrent_ms, 3)},
+            "memory": {
+                "allocated_mb": rounded(allocated_mb),
+                "allocation_rate_mb_s": per_second(allocated_mb),
+                "promoted_mb": rounded(promoted_mb),
+                "promotion_rate_mb_s": per_second(promoted_mb),
+                "promoted_percent": percent(promoted_mb, self.young_allocated_mb),
+                "peak_heap_mb": rounded(self.peak_heap_mb),
+            },
+            "overhead": {
+                "pauses_per_s": per_elapsed(self.pauses.count),
+                "safepoints_per_s": per_elapsed(self.safepoints.count),
+                "pause_time_percent": percent(self.pauses.total / 1e3 if self.pauses.count else None, elapsed),
+                "stw_gc_cpu_s": rounded(stw_gc_cpu_s),
+                "stw_gc_cpu_percent": percent(stw_gc_cpu_s, elapsed * self.cpus) if self.cpus else None,
+                "cpus": self.cpus,
+                "safepoint_time_percent": percent(
+                    self.safepoints.total / 1e3 if self.safepoints.count else None, elapsed
+                ),
+            },
+            "safepoints_ms": self.safepoints.summary(),
+            "time_to_safepoint_ms": self.ttsp.summary(),
+            "safepoint_ops": {
+                op: {k: round(v, 3) for k, v in stats.items()}
+                for op, stats in sorted(self.safepoint_ops.items(), key=lambda item: -item[1]["total_ms"])
+            },
+        }
+
+
+def open_log(path):
+    """Open a plain or gzip-compressed log, or stdin for '-'"""
+    if path == "-":
+        return sys.stdin
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", errors="replace")
+    return open(path, "r", errors="replace")
+
+
+def analyze_log(path, cpus=None):
+    """Stream a GC log file through the analyzer and return its results"""
+    analyzer = GCLogAnalyzer(cpus=cpus)
+    with open_log(path) as f:
+        for line in f:
+            analyzer.feed(line)
+    return analyzer.results()
+
+
+# Metrics shown in reports: (label, section, key, unit, lower_is_better)
+# Absolute totals depend on log length, so only rates/percentiles get verdicts
+REPORT_METRICS = [
+    ("Elapsed", "elapsed_s", None, "s", None),
+    ("GC pauses", "pauses_ms", "count", "", None),
+    ("GC pauses/s", "overhead", "pauses_per_s", "", True),
+    ("Pause p50", "pauses_ms", "p50", "ms", True),
+    ("Pause p90", "pauses_ms", "p90", "ms", True),
+    ("Pause p99", "pauses_ms", "p99", "ms", True),
+    ("Pause p99.9", "pauses_ms", "p99.9", "ms", True),
+    ("Pause max", "pauses_ms", "max", "ms", True),
+    ("Pause total", "pauses_ms", "total", "ms", None),
+    ("Pause time", "overhead", "pause_time_percent", "%", True),
+    ("STW GC CPU time", "overhead", "stw_gc_cpu_s", "s", None),
+    ("STW GC CPU", "overhead", "stw_gc_cpu_percent", "%", True),
+    ("Allocation rate", "memory", "allocation_rate_mb_s", "MB/s", None),
+    ("Promotion rate", "memory", "promotion_rate_mb_s", "MB/s", True),
+    ("Peak heap", "memory", "peak_heap_mb", "MB", None),
+    ("Safepoints", "safepoints_ms", "count", "", None),
+    ("Safepoints/s", "overhead", "safepoints_per_s", "", True),
+    ("Safepoint time", "overhead", "safepoint_time_percent", "%", True),
+    ("TTSP p50", "time_to_safepoint_ms", "p50", "ms", True),
+    ("TTSP p99", "time_to_safepoint_ms", "p99", "ms", True),
+    ("TTSP max", "time_to_safepoint_ms", "max", "ms", True),
+]
+
+
+def metric_value(result, section, key):
+    value = result.get(section)
+    return value.get(key) if key is not None and isinstance(value, dict) else value
+
+
+def format_value(value, unit):
+    if value is None:
+        return "-"
+    if isinstance(value, int):
+        return f"{value:,}{(' ' + unit) if unit else ''}"
+    return f"{value:,.3f} {unit}".rstrip()
+
+
+def print_analysis(path, result):
+    """Print formatted analysis of a single log"""
+    print("\n" + "=" * 70)
+    print("  JVM GC / SAFEPOINT LOG ANALYSIS")
+    print("=" * 70)
+    print(f"\nLog:      {path}")
+    print(f"Lines:    {result['lines']:,}")
+
+    print("\n" + "-" * 70)
+    print("KEY METRICS:")
+    print("-" * 70)
+    for label, section, key, unit, _ in REPORT_METRICS:
+        print(f"  {label + ':':<20}{format_value(metric_value(result, section, key), unit)}")
+
+    if result["pause_causes"]:
+        print("\n" + "-" * 70)
+        print("PAUSES BY TYPE:")
+        print("-" * 70)
+        for name, stats in list(result["pause_causes"].items())[:10]:
+            print(f"  {name[:42]:<44}{stats['count']:>7,}  total {stats['total_ms']:>10,.1f} ms  max {stats['max_ms']:>8,.1f} ms")
+
+    if result["safepoint_ops"]:
+        print("\n" + "-" * 70)
+        print("SAFEPOINTS BY VM OPERATION:")
+        print("-" * 70)
+        for op, stats in list(result["safepoint_ops"].items())[:10]:
+            print(f"  {op[:42]:<44}{stats['count']:>7,}  total {stats['total_ms']:>10,.1f} ms  max TTSP {stats['max_ttsp_ms']:>6,.1f} ms")
+
+    print_findings(result)
+    print("=" * 70 + "\n")
+
+
+def print_findings(result):
+    """Print Graviton tuning hints derived from the measured metrics"""
+    findings = []
+    overhead = result["overhead"]
+    pauses = result["pauses_ms"]
+    ttsp = result["time_to_safepoint_ms"]
+
+    if not pauses["count"] and not result["safepoints_ms"]["count"]:
+        findings.append(f"No GC or safepoint events found. Enable logging with: {XLOG_FLAGS}")
+    if (overhead["pause_time_percent"] or 0) > 5:
+        findings.append("GC pauses exceed 5% of wall time: increase heap/young gen or review allocation hot spots")
+    if (overhead["stw_gc_cpu_percent"] or 0) > 10:
+        findings.append("Stop-the-world GC uses >10% of available CPU: check -XX:ParallelGCThreads vs vCPU count")
+    if (pauses["p99"] or 0) > 200:
+        findings.append("p99 pause above 200ms: consider -XX:MaxGCPauseMillis, or ZGC/Shenandoah on JDK 17+")
+    if (ttsp["p99"] or 0) > 10:
+        findings.append("p99 time-to-safepoint above 10ms: look for long counted loops (-XX:+UseCountedLoopSafepoints)")
+    if (result["memory"]["promoted_percent"] or 0) > 20:
+        findings.append("Over 20% of allocations are promoted: young gen may be undersized (premature promotion)")
+    if overhead["cpus"] is None and overhead["stw_gc_cpu_s"]:
+        findings.append("CPU count not found in log; pass --cpus N to compute STW GC CPU overhead")
+
+    print("\n" + "-" * 70)
+    print("FINDINGS:")
+    print("-" * 70)
+    if not findings:
+        print("  No GC or safepoint problems detected")
+    for finding in findings:
+        print(f"  → {finding}")
+
+
+def compare_results(baseline, candidate):
+    """Compute per-metric deltas between two analyses"""
+    comparison = {}
+    for label, section, key, unit, lower_is_better in REPORT_METRICS:
+        before = metric_value(baseline, section, key)
+        after = metric_value(candidate, section, key)
+        change = None
+        if before and after is not None:
+            change = round((after - before) / before * 100, 2)
+        verdict = None
+        if change is not None and lower_is_better is not None and abs(change) >= 1:
+            verdict = "better" if (change < 0) == lower_is_better else "worse"
+        comparison[label] = {"baseline": before, "candidate": after, "unit": unit, "change_percent": change, "verdict": verdict}
+    return comparison
+
+
+def print_comparison(baseline_label, candidate_label, comparison):
+    """Print formatted side-by-side comparison"""
+    print("\n" + "=" * 70)
+    print("  JVM GC / SAFEPOINT LOG COMPARISON")
+    print("=" * 70)
+    print(f"\nBaseline:  {baseline_label}")
+    print(f"Candidate: {candidate_label}")
+
+    print("\n" + "-" * 70)
+    print(f"  {'Metric':<18}{'Baseline':>16}{'Candidate':>16}{'Change':>10}")
+    print("-" * 70)
+    for label, row in comparison.items():
+        change = f"{row['change_percent']:+.1f}%" if row["change_percent"] is not None else "-"
+        verdict = f"  {row['verdict']}" if row["verdict"] else ""
+        print(
+            f"  {label:<18}{format_value(row['baseline'], row['unit']):>16}"
+            f"{format_value(row['candidate'], row['unit']):>16}{change:>10}{verdict}"
+        )
+
+    print("\nℹ️  Notes:")
+    print("  • Compare logs covering the same workload and duration")
+    print("  • Allocation rate tracks throughput; higher is not necessarily worse")
+    print("  • STW GC CPU covers stop-the-world pauses only, not concurrent GC threads")
+    print("  • '-' means the log has no data for a metric; such rows get no verdict")
+    print("=" * 70 + "\n")
+
+
+# Fixture logs and expected metrics for --self-test (dotted paths into results())
+TESTDATA_DIR = Path(__file__).resolve().parent / "testdata" / "gc-logs"
+SELF_TEST_CASES = {
+    "g1-jdk11.log": {
+        "elapsed_s": 2.995,
+        "pauses_ms.count": 2,
+        "pauses_ms.max": 5.5,
+        "memory.allocated_mb": 20.0,
+        "memory.promoted_mb": 5.0,
+        "overhead.stw_gc_cpu_s": 0.06,
+        "overhead.stw_gc_cpu_percent": None,
+        "safepoints_ms.count": 2,
+        "time_to_safepoint_ms.max": 0.3,
+    },
+    "g1-jdk17.log": {
+        "elapsed_s": 4.0,
+        "pauses_ms.count": 4,
+        "memory.allocated_mb": 29.0,
+        "memory.promoted_mb": 8.0,
+        "overhead.cpus": 4,
+        "overhead.stw_gc_cpu_s": 0.08,
+        "overhead.stw_gc_cpu_percent": 0.5,
+        "concurrent.phases": 1,
+        "safepoints_ms.count": 3,
+        "time_to_safepoint_ms.max": 0.5,
+        "safepoint_ops.G1CollectForAllocation.count": 2,
+    },
+    "parallel-jdk11.log": {
+        "pauses_ms.count": 2,
+        "memory.allocated_mb": 50.0,
+        "memory.promoted_mb": 12.0,
+        "memory.promotion_rate_mb_s": 6.0,
+    },
+    "parallel-jdk17.log": {
+        "pauses_ms.count": 2,
+        "memory.allocated_mb": 50.0,
+        "memory.promoted_mb": 12.0,
+        "memory.promotion_rate_mb_s": 6.0,
+    },
+    "serial-jdk17.log": {
+        "pauses_ms.count": 2,
+        "memory.promoted_mb": 6.0,
+    },
+    "zgc-jdk17.log": {
+        "pauses_ms.count": 3,
+        "concurrent.phases": 1,
+        "memory.allocated_mb": 100.0,
+        "memory.promoted_mb": None,
+        "overhead.stw_gc_cpu_s": None,
+        "overhead.stw_gc_cpu_percent": None,
+    },
+    "shenandoah-jdk17.log": {
+        "pauses_ms.count": 2,
+        "concurrent.phases": 3,
+        "memory.allocated_mb": 40.0,
+        "memory.peak_heap_mb": 110.0,
+        "overhead.stw_gc_cpu_s": None,
+    },
+    "shenandoah-full-cycle.log": {
+        "pauses_ms.count": 4,
+        "concurrent.phases": 5,
+        "memory.allocated_mb": 500.0,
+        "memory.peak_heap_mb": 500.0,
+        "memory.promoted_mb": None,
+    },
+    "g1-mixed.log": {
+        "pauses_ms.count": 4,
+        "memory.allocated_mb": 300.0,
+        "memory.promoted_mb": 20.0,
+        "memory.promoted_percent": 20.0,
+    },
+    "rotated-restart.log": {
+        "elapsed_s": 3.0,
+        "pauses_ms.count": 2,
+    },
+    "no-events.log": {
+        "pauses_ms.count": None,
+        "pauses_ms.p99": None,
+        "memory.allocated_mb": None,
+        "memory.peak_heap_mb": None,
+        "overhead.pause_time_percent": None,
+        "safepoints_ms.count": None,
+    },
+}
+# (baseline, candidate, {metric label: expected verdict})
+SELF_TEST_COMPARISONS = [
+    ("parallel-jdk11.log", "parallel-jdk17.log", {"Promotion rate": None}),
+    ("g1-jdk17.log", "zgc-jdk17.log", {"STW GC CPU time": None, "STW GC CPU": None, "Promotion rate": None}),
+    ("g1-jdk11.log", "g1-jdk17.log", {"GC pauses": None, "Pause total": None, "STW GC CPU time": None, "Safepoints": None}),
+]
+
+
+def lookup(result, dotted):
+    """Resolve a dotted path like 'memory.promoted_mb' in a results dict"""
+    value = result
+    for part in dotted.split("."):
+        value = value.get(part) if isinstance(value, dict) else None
+    return value
+
+
+def run_self_test():
+    """Analyze bundled fixture logs and check them against expected metrics"""
+    failures = 0
+    results = {}
+    for name, expected in SELF_TEST_CASES.items():
+        results[name] = analyze_log(str(TESTDATA_DIR / name))
+        errors = []
+        for path, want in expected.items():
+            got = lookup(results[name], path)
+            if want is None or got is None:
+                ok = got is want
+            else:
+                ok = math.isclose(got, want, rel_tol=1e-6, abs_tol=1e-3)
+            if not ok:
+                errors.append(f"{path}: expected {want}, got {got}")
+        print(f"  [{'OK' if not errors else 'FAIL'}] {name}")
+        for error in errors:
+            print(f"      {error}")
+        failures += bool(errors)
+
+    for baseline, candidate, expected in SELF_TEST_COMPARISONS:
+        comparison = compare_results(results[baseline], results[candidate])
+        errors = [
+            f"{label}: expected verdict {want}, got {comparison[label]['verdict']}"
+            for label, want in expected.items()
+            if comparison[label]["verdict"] != want
+        ]
+        print(f"  [{'OK' if not errors else 'FAIL'}] {baseline} vs {candidate}")
+        for error in errors:
+            print(f"      {error}")
+        failures += bool(errors)
+
+    print(f"\n{failures} failure(s)" if failures else "\nAll self-tests passed")
+    return 1 if failures else 0
+
+
+def parse_cpus(value):
+    """Parse --cpus as 'N' (both logs) or 'N,M' (baseline,candidate)"""
+    try:
+        cpus = [int(part) for part in value.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected N or N,M, got {value!r}")
+    if len(cpus) > 2 or any(cpu <= 0 for cpu in cpus):
+        raise argparse.ArgumentTypeError(f"expected one or two positive counts, got {value!r}")
+    return cpus
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Analyze unified JVM GC/safepoint logs; pass two logs to compare them.",
+        epilog=f"Enable logging with: {XLOG_FLAGS}",
+    )
+    parser.add_argument("logs", nargs="*", help="GC log file(s) (.gz supported, '-' for stdin); give two to compare")
+    parser.add_argument(
+        "--cpus",
+        type=parse_cpus,
+        metavar="N[,M]",
+        help="vCPUs available to the JVM; N,M gives baseline and candidate separately (default: read from log)",
+    )
+    parser.add_argument("--json", metavar="FILE", help="Save detailed analysis as JSON")
+    parser.add_argument("--self-test", action="store_true", help="Check the parser against bundled sample logs")
+    args = parser.parse_args()
+
+    if args.self_test:
+        sys.exit(run_self_test())
+    if not args.logs:
+        parser.error("at least one log is required")
+    if len(args.logs) > 2:
+        parser.error("at most two logs (baseline and candidate) can be given")
+    if args.logs.count("-") > 1:
+        parser.error("stdin ('-') can only be used for one of the logs")
+
+    cpus = args.cpus or [None]
+    if len(cpus) > len(args.logs):
+        parser.error("--cpus N,M requires two logs")
+    cpus = cpus * len(args.logs) if len(cpus) == 1 else cpus
+
+    for path in args.logs:
+        if path != "-" and not Path(path).exists():
+            print(f"Error: Log file not found: {path}")
+            sys.exit(1)
+        if path != "-" and not Path(path).is_file():
+            print(f"Error: Not a regular file: {path}")
+            sys.exit(1)
+
+    results = []
+    for path, log_cpus in zip(args.logs, cpus):
+        try:
+            results.append(analyze_log(path, cpus=log_cpus))
+        except (OSError, EOFError) as e:
+            print(f"Error: Cannot read log file {path}: {e}")
+            sys.exit(1)
+
+    if len(results) == 1:
+        print_analysis(args.logs[0], results[0])
+        output = results[0]
+    else:
+        comparison = compare_results(results[0], results[1])
+        print_comparison(args.logs[0], args.logs[1], comparison)
+        output = {"baseline": results[0], "candidate": results[1], "comparison": comparison}
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(output, f, indent=2)
+        print(f"Detailed analysis saved to: {args.json}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -220,6 +220,11 @@ echo "  For profiling/flamegraph support, add:"
 echo "    -XX:+PreserveFramePointer"
 echo "    -agentpath:/usr/lib64/libperf-jvmti.so"
 echo ""
+echo "  To measure GC/safepoint impact of these flags, add:"
+echo "    -Xlog:gc*,safepoint:file=gc.log:time,uptime,level,tags:filecount=10,filesize=100m"
+echo "  then compare logs before/after with:"
+echo "    ./scripts/analyze-gc-log.py gc-before.log gc-after.log"
+echo ""
 
 # ---- Summary ----
 echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"